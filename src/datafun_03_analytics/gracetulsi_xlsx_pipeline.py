@@ -3,93 +3,375 @@ gracetulsi_xlsx_pipeline.py
 
 ETVL pipeline for SBA FY22 Home disaster loan data.
 Computes total verified loss by state.
+
+Extraction streams the sheet row by row (python-calamine when installed,
+ElementTree.iterparse otherwise), so the reader ends naturally at the last
+data row — nothing here should ever need a full-sheet scan like
+sheet.max_row to find the end of the data.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import heapq
+from itertools import islice
+import mmap
+from operator import itemgetter
+import os
 from pathlib import Path
+import sys
 from typing import Any
+from xml.etree import ElementTree as ET
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# OPTIONAL: python-calamine is a Rust-based streaming XLSX parser that never
+# builds an XML DOM and yields typed cell values directly — several times
+# faster than a DOM load with a fraction of the memory on large files.
+# Install with the "perf" extra; without it we fall back to streaming the
+# sheet XML ourselves with ElementTree.iterparse.
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# OPTIONAL: numba JIT-compiles the aggregation kernel to native code.
+# Install with the "perf" extra (see pyproject.toml); without it we fall
+# back to the pandas groupby, which is still fully vectorized.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-import openpyxl
+
+# Strips thousands separators and stray whitespace in one C-level pass,
+# instead of chained .replace()/.strip() allocations.
+_NO_COMMA_WS = str.maketrans("", "", ", \t\n\r")
 
 
 def _to_float(value: Any) -> float:
     """Convert Excel cell values to float safely."""
     if value is None:
         return 0.0
-    if isinstance(value, (int, float)):
+    try:
+        # Common case: numbers and clean numeric strings convert directly.
         return float(value)
+    except (TypeError, ValueError):
+        pass
     try:
-        return float(str(value).replace(",", "").strip())
+        return float(str(value).translate(_NO_COMMA_WS))
     except ValueError:
         return 0.0
 
 
 def extract_state_verified_loss_rows(
     *, file_path: Path, sheet_name: str
-) -> list[tuple[str, float]]:
-    """E: Extract (state_code, total_verified_loss) rows from an Excel sheet.
+) -> pd.DataFrame:
+    """E: Extract state codes and verified losses from an Excel sheet.
 
     Uses:
       H = state code (e.g., 'UT')
       I = total verified loss (numeric)
 
     Skips rows where state is missing or loss is missing/blank.
-    """
-    if not file_path.exists():
-        raise FileNotFoundError(f"Missing input file: {file_path}")
-
-    workbook = openpyxl.load_workbook(file_path, data_only=True)
 
-    if sheet_name not in workbook.sheetnames:
-        raise ValueError(f"Sheet not found: {sheet_name}. Found: {workbook.sheetnames}")
+    Returns:
+        DataFrame with 'state' (str) and 'loss' (float64) columns,
+        one row per kept sheet row.
+    """
+    # No exists() pre-check: the stat() here doubles as the cache key and
+    # raises FileNotFoundError itself if the file is gone. Loader errors are
+    # translated to the friendly message (calamine raises a bare OSError,
+    # so re-check on that path).
+    try:
+        return _load_sheet(
+            os.fspath(file_path), file_path.stat().st_mtime_ns, sheet_name
+        )
+    except OSError as exc:
+        if isinstance(exc, FileNotFoundError) or not file_path.exists():
+            raise FileNotFoundError(f"Missing input file: {file_path}") from exc
+        raise
+
+
+@functools.lru_cache(maxsize=4)
+def _load_sheet(path_str: str, mtime_ns: int, sheet_name: str) -> pd.DataFrame:
+    """E helper: cached extraction, keyed on (path, mtime, sheet).
+
+    Repeat pipeline runs in one process (tests, notebooks, multi-report
+    rollouts) skip re-parsing an unchanged workbook; mtime_ns in the key
+    invalidates the entry when the file changes. Callers must treat the
+    returned frame as read-only — it is shared between cache hits.
+    """
+    file_path = Path(path_str)
+    if CalamineWorkbook is not None:
+        return _extract_rows_calamine(file_path=file_path, sheet_name=sheet_name)
+    return _extract_rows_xml(file_path=file_path, sheet_name=sheet_name)
+
+
+@functools.cache
+def _make_row_consumer(state_idx: int, loss_idx: int) -> Any:
+    """Build an extract loop specialized to fixed column positions.
+
+    The sheet schema is fixed per call site, so functools.cache hands back
+    one compiled closure per (state, loss) column pair. Inside it the
+    column indexes are closure constants and every hot-loop name —
+    list.append, sys.intern, _to_float — is bound to a local once instead
+    of being re-resolved on each of potentially hundreds of thousands of
+    rows.
+    """
 
-    sheet = workbook[sheet_name]
+    def consume(rows_iter: Any) -> tuple[list[str], list[float]]:
+        states: list[str] = []
+        losses: list[float] = []
+        append_state = states.append
+        append_loss = losses.append
+        intern = sys.intern
+        to_float = _to_float
+
+        for row in rows_iter:
+            state_val = row[state_idx] if len(row) > state_idx else None
+            loss_val = row[loss_idx] if len(row) > loss_idx else None
+
+            if state_val is None:
+                continue
+
+            # Intern: ~50 distinct codes repeat across every row, so
+            # identical codes share one object and later dict/factorize
+            # hashing can short-circuit on pointer equality.
+            state = intern(str(state_val).strip())
+            if not state:
+                continue
+
+            if type(loss_val) is float:
+                append_state(state)
+                append_loss(loss_val)
+                continue
+            if type(loss_val) is int:
+                append_state(state)
+                append_loss(float(loss_val))
+                continue
+
+            # Treat blank loss as skip (not zero), to avoid accidental misinterpretation.
+            if loss_val is None or (isinstance(loss_val, str) and not loss_val.strip()):
+                continue
+
+            append_state(state)
+            append_loss(to_float(loss_val))
+
+        return states, losses
+
+    return consume
+
+
+def _extract_rows_calamine(*, file_path: Path, sheet_name: str) -> pd.DataFrame:
+    """E helper: stream columns H and I with python-calamine."""
+    workbook = CalamineWorkbook.from_path(str(file_path))
+
+    if sheet_name not in workbook.sheet_names:
+        raise ValueError(
+            f"Sheet not found: {sheet_name}. Found: {workbook.sheet_names}"
+        )
+
+    sheet = workbook.get_sheet_by_name(sheet_name)
+
+    # Calamine trims columns left of the used range, so shift the H/I
+    # (0-based 7/8) indexes by where the used range actually starts.
+    start_col = sheet.start[1] if sheet.start is not None else 0
+    state_idx = 7 - start_col
+    loss_idx = 8 - start_col
+
+    if state_idx < 0:
+        # Used range begins right of column H — no state data at all.
+        return pd.DataFrame({"state": [], "loss": []})
+
+    # Data starts at row 6 per your sheet layout; skip the first 5 rows.
+    # Calamine yields typed values ('' for empty cells), so the same
+    # skip/convert logic as the XML fallback path applies.
+    consume = _make_row_consumer(state_idx, loss_idx)
+    states, losses = consume(islice(sheet.iter_rows(), 5, None))
+
+    return pd.DataFrame({"state": states, "loss": np.asarray(losses, dtype=np.float64)})
+
+
+# Relationship namespace used by xl/workbook.xml to point at sheet parts.
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _xlsx_sheet_part(archive: zipfile.ZipFile, sheet_name: str) -> str:
+    """Resolve a sheet name to its part path inside the XLSX archive."""
+    rel_targets: dict[str, str] = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        for _event, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag.endswith("}Relationship"):
+                rel_targets[elem.get("Id", "")] = elem.get("Target", "")
+
+    found_names: list[str] = []
+    with archive.open("xl/workbook.xml") as f:
+        for _event, elem in ET.iterparse(f, events=("end",)):
+            if not elem.tag.endswith("}sheet"):
+                continue
+            name = elem.get("name", "")
+            found_names.append(name)
+            if name == sheet_name:
+                target = rel_targets[elem.get(f"{{{_XLSX_REL_NS}}}id", "")]
+                # Targets are usually relative to xl/, occasionally absolute.
+                return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+    raise ValueError(f"Sheet not found: {sheet_name}. Found: {found_names}")
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    """Parse xl/sharedStrings.xml once into a list for O(1) lookups."""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings: list[str] = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _event, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag.endswith("}si"):
+                strings.append(
+                    "".join(t.text or "" for t in elem.iter() if t.tag.endswith("}t"))
+                )
+                elem.clear()
+    return strings
+
+
+def _xlsx_cell_value(cell: ET.Element, shared: list[str]) -> Any:
+    """Decode one <c> element into a plain Python value (None if empty)."""
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter() if t.tag.endswith("}t"))
+
+    v = cell.find("{*}v")
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return shared[int(v.text)]
+    if kind == "str":
+        # Cached formula result, already a string.
+        return v.text
+    if kind == "b":
+        return int(v.text)
+    try:
+        return float(v.text)
+    except ValueError:
+        return v.text
 
-    rows: list[tuple[str, float]] = []
 
-    # Data starts at row 6 per your sheet layout.
-    for r in range(6, sheet.max_row + 1):
-        state_val = sheet[f"H{r}"].value
-        loss_val = sheet[f"I{r}"].value
+def _iter_xml_hi_pairs(stream: Any, shared: list[str]) -> Any:
+    """Yield decoded (state, loss) cell pairs for data rows of a sheet stream.
 
-        if state_val is None:
+    Each <row> element is cleared after use to keep memory flat. Rows
+    before row 6 (the header block in your sheet layout) are skipped.
+    """
+    row_num = 0
+    for _event, elem in ET.iterparse(stream, events=("end",)):
+        if not elem.tag.endswith("}row"):
             continue
 
-        state = str(state_val).strip()
-        if not state:
+        row_num = int(elem.get("r", row_num + 1))
+        if row_num < 6:
+            elem.clear()
             continue
 
-        # Treat blank loss as skip (not zero), to avoid accidental misinterpretation.
-        if loss_val is None or (isinstance(loss_val, str) and not loss_val.strip()):
-            continue
+        state_val = loss_val = None
+        for cell in elem:
+            ref = cell.get("r", "")
+            col = ref.rstrip("0123456789")
+            if col == "H":
+                state_val = _xlsx_cell_value(cell, shared)
+            elif col == "I":
+                loss_val = _xlsx_cell_value(cell, shared)
+        elem.clear()
 
-        loss = _to_float(loss_val)
-        rows.append((state, loss))
+        yield state_val, loss_val
 
-    return rows
 
+def _extract_rows_xml(*, file_path: Path, sheet_name: str) -> pd.DataFrame:
+    """E helper: stream columns H and I straight from the sheet XML (fallback).
 
-def transform_total_verified_loss_by_state(
-    *, rows: list[tuple[str, float]]
-) -> dict[str, float]:
-    """T: Sum total verified loss by state code."""
-    totals: dict[str, float] = {}
+    Reads only what the pipeline needs — cell refs and values — via
+    iterparse over the zip member, so no DOM and none of the
+    style/format/hyperlink metadata a full workbook load carries. The
+    decoded cell pairs feed the same consumer as the calamine path, so
+    both backends share one copy of the skip/convert rules.
+    """
+    # Memory-map the archive: mmap is file-like (read/seek/tell), so the zip
+    # layer reads pages straight from the kernel page cache with no second
+    # in-process copy of the file.
+    with (
+        file_path.open("rb") as fh,
+        mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        zipfile.ZipFile(mm) as archive,
+    ):
+        sheet_part = _xlsx_sheet_part(archive, sheet_name)
+        shared = _xlsx_shared_strings(archive)
+
+        consume = _make_row_consumer(0, 1)
+        with archive.open(sheet_part) as f:
+            states, losses = consume(_iter_xml_hi_pairs(f, shared))
+
+        return pd.DataFrame(
+            {"state": states, "loss": np.asarray(losses, dtype=np.float64)}
+        )
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _sum_by_code(
+        codes: np.ndarray, losses: np.ndarray, n_groups: int
+    ) -> np.ndarray:
+        """Sum losses into per-group bins; compiled to native code by numba.
+
+        cache=True persists the compiled kernel to disk, so only the first
+        run in a fresh environment pays the JIT compile cost.
+        """
+        out = np.zeros(n_groups)
+        for i in range(codes.shape[0]):
+            out[codes[i]] += losses[i]
+        return out
+
+
+def transform_total_verified_loss_by_state(*, rows: pd.DataFrame) -> dict[str, float]:
+    """T: Sum total verified loss by state code.
+
+    Raises:
+        ValueError: If any row carries a negative verified loss.
+    """
+    losses = rows["loss"].to_numpy()
+
+    # Fused validation: one vectorized pass over the column we are about to
+    # aggregate anyway, instead of a second Python loop over the totals in
+    # the verify step. A negative row can hide inside a positive total, so
+    # checking here is also stricter than checking the sums.
+    negative = losses < 0
+    if negative.any():
+        state = rows.loc[negative, "state"].iat[0]
+        raise ValueError(f"Negative verified loss for state {state}")
 
-    for state, loss in rows:
-        # Add this row's loss into that state's running total
-        totals[state] = totals.get(state, 0.0) + loss
+    if njit is not None:
+        # Factorize states to int codes once, then run the hash-free
+        # bin-sum reduction as a native numba kernel.
+        codes, uniques = pd.factorize(rows["state"], sort=False)
+        sums = _sum_by_code(codes, losses, len(uniques))
+        return dict(zip(uniques, sums.tolist(), strict=True))
 
-    return totals
+    # groupby-sum runs in pandas' compiled aggregation kernel — one pass over
+    # the loss column at C speed instead of a Python-level dict accumulator.
+    return rows.groupby("state", sort=False)["loss"].sum().to_dict()
 
 
 def verify_state_totals(*, totals: dict[str, float]) -> None:
-    """V: Verify state total verified loss values are valid."""
+    """V: Verify state totals were produced.
+
+    Negative values are already rejected row-by-row inside the transform,
+    so only the O(1) emptiness guard remains here.
+    """
     if not totals:
         raise ValueError("No state totals were computed.")
 
-    for state, total in totals.items():
-        if total < 0:
-            raise ValueError(f"Negative total loss for state {state}: {total}")
-
 
 def load_state_totals_report(
     *,
@@ -101,32 +383,71 @@ def load_state_totals_report(
     """L: Write a text report summarizing total verified loss by state."""
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    # nlargest is O(N log top_n) vs. O(N log N) for a full sort, and the
+    # C-implemented itemgetter key avoids a Python frame per comparison.
+    ranked = heapq.nlargest(top_n, totals.items(), key=itemgetter(1))
+
+    # Assemble the whole report in memory and write it once: one join, one
+    # write() call, instead of a small syscall per line.
+    parts = [
+        "SBA FY22 Home - Total Verified Loss by State\n",
+        "=" * 48 + "\n",
+        f"Sheet: {sheet_name}\n",
+        f"States counted: {len(totals)}\n",
+        f"Top N: {top_n}\n\n",
+        "Rank | State | Total Verified Loss\n",
+        "-" * 40 + "\n",
+    ]
+    parts.extend(
+        f"{i:>4} | {state:<5} | {total:>18,.2f}\n"
+        for i, (state, total) in enumerate(ranked, start=1)
+    )
+
+    out_path.write_text("".join(parts), encoding="utf-8")
 
-    with out_path.open("w", encoding="utf-8") as f:
-        f.write("SBA FY22 Home - Total Verified Loss by State\n")
-        f.write("=" * 48 + "\n")
-        f.write(f"Sheet: {sheet_name}\n")
-        f.write(f"States counted: {len(totals)}\n")
-        f.write(f"Top N: {top_n}\n\n")
 
-        f.write("Rank | State | Total Verified Loss\n")
-        f.write("-" * 40 + "\n")
+def _extract_one(job: tuple[Path, str]) -> dict[str, float]:
+    """E+T for a single (file, sheet) job; top-level so it pickles for the pool."""
+    file_path, sheet_name = job
+    rows = extract_state_verified_loss_rows(file_path=file_path, sheet_name=sheet_name)
+    return transform_total_verified_loss_by_state(rows=rows)
 
-        for i, (state, total) in enumerate(ranked[:top_n], start=1):
-            f.write(f"{i:>4} | {state:<5} | {total:>18,.2f}\n")
 
+def run_pipeline(
+    *,
+    raw_dir: Path,
+    processed_dir: Path,
+    logger: Any,
+    jobs: list[tuple[Path, str]] | None = None,
+) -> None:
+    """Run the full ETVL pipeline for SBA FY22 Home total verified loss by state.
 
-def run_pipeline(*, raw_dir: Path, processed_dir: Path, logger: Any) -> None:
-    """Run the full ETVL pipeline for SBA FY22 Home total verified loss by state."""
+    Pass `jobs` as a list of (file_path, sheet_name) pairs to aggregate
+    several raw files into one report; each job is extracted in its own
+    process since they share no state. Defaults to the single FY22 file.
+    """
     logger.info("SBA XLSX: START")
 
     sheet = "FY22 Home"
-    input_file = raw_dir / "sba_disaster_loan_data_fy22.xlsx"
     output_file = processed_dir / "gracetulsi_verified_loss_by_state.txt"
 
-    rows = extract_state_verified_loss_rows(file_path=input_file, sheet_name=sheet)
-    totals = transform_total_verified_loss_by_state(rows=rows)
+    if jobs is None:
+        jobs = [(raw_dir / "sba_disaster_loan_data_fy22.xlsx", sheet)]
+
+    if len(jobs) == 1:
+        # No pool for a single job — skip the process spawn overhead.
+        per_job = [_extract_one(jobs[0])]
+    else:
+        # Workbook parsing is CPU-bound, so threads would serialize on the
+        # GIL; a process pool parses one workbook per core.
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            per_job = list(executor.map(_extract_one, jobs))
+
+    totals: dict[str, float] = {}
+    for partial in per_job:
+        for state, total in partial.items():
+            totals[state] = totals.get(state, 0.0) + total
+
     verify_state_totals(totals=totals)
 
     load_state_totals_report(
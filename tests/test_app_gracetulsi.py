@@ -0,0 +1,149 @@
+# tests/test_app_gracetulsi.py
+#
+# Simple, clear pytest examples for the gracetulsi pipeline modules.
+#
+# Assumptions:
+# - module is importable
+# - pytest running from project root
+#
+# Run:
+#   uv run pytest
+
+from pathlib import Path
+import zipfile
+
+import openpyxl
+import pytest
+
+from datafun_03_analytics import gracetulsi_xlsx_pipeline
+
+
+def test_ok():
+    assert True
+
+
+def test_gracetulsi_xlsx_pipeline_exists():
+    assert gracetulsi_xlsx_pipeline is not None
+
+
+# === EXTRACT BEHAVIOR (both backends) ===
+
+# The fixture mirrors the real sheet layout: five header rows, then state
+# codes in column H and verified losses in column I starting at row 6.
+# Expected result after the skip/convert rules:
+# - the "1,234.50" string converts to 1234.5
+# - the row with a blank state is skipped
+# - the row with a blank loss is skipped (not treated as zero)
+# - the int loss converts to float
+_EXPECTED_STATES = ["UT", "CA", "UT", "TX", "CA"]
+_EXPECTED_LOSSES = [100.5, 200.0, 50.25, 1234.5, 10.0]
+
+
+def _write_fixture_workbook(file_path: Path) -> None:
+    """Write a small workbook matching the SBA sheet layout."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "FY22 Home"
+
+    sheet["A1"] = "SBA Disaster Loan Data (fixture)"
+    sheet["H5"] = "Damaged Property State"
+    sheet["I5"] = "Total Verified Loss"
+
+    data = [
+        ("UT", 100.5),
+        ("CA", 200.0),
+        ("UT", 50.25),
+        ("TX", "1,234.50"),
+        ("", 9.9),
+        ("NV", None),
+        ("CA", 10),
+    ]
+    for row_offset, (state, loss) in enumerate(data):
+        sheet.cell(row=6 + row_offset, column=8, value=state)
+        sheet.cell(row=6 + row_offset, column=9, value=loss)
+
+    workbook.save(file_path)
+
+
+def test_extract_rows_xml_from_fixture(tmp_path):
+    fixture = tmp_path / "sba_fixture.xlsx"
+    _write_fixture_workbook(fixture)
+
+    rows = gracetulsi_xlsx_pipeline._extract_rows_xml(
+        file_path=fixture, sheet_name="FY22 Home"
+    )
+
+    assert rows["state"].tolist() == _EXPECTED_STATES
+    assert rows["loss"].tolist() == _EXPECTED_LOSSES
+
+
+@pytest.mark.skipif(
+    gracetulsi_xlsx_pipeline.CalamineWorkbook is None,
+    reason="python-calamine not installed (perf extra)",
+)
+def test_extract_backends_match(tmp_path):
+    fixture = tmp_path / "sba_fixture.xlsx"
+    _write_fixture_workbook(fixture)
+
+    via_calamine = gracetulsi_xlsx_pipeline._extract_rows_calamine(
+        file_path=fixture, sheet_name="FY22 Home"
+    )
+    via_xml = gracetulsi_xlsx_pipeline._extract_rows_xml(
+        file_path=fixture, sheet_name="FY22 Home"
+    )
+
+    assert via_calamine["state"].tolist() == _EXPECTED_STATES
+    assert via_calamine["state"].tolist() == via_xml["state"].tolist()
+    assert via_calamine["loss"].tolist() == via_xml["loss"].tolist()
+
+
+def test_extract_rows_xml_missing_sheet(tmp_path):
+    fixture = tmp_path / "sba_fixture.xlsx"
+    _write_fixture_workbook(fixture)
+
+    with pytest.raises(ValueError, match="Sheet not found"):
+        gracetulsi_xlsx_pipeline._extract_rows_xml(
+            file_path=fixture, sheet_name="FY23 Home"
+        )
+
+
+def test_extract_rows_xml_decodes_cell_types(tmp_path):
+    # Hand-built archive for the decode paths openpyxl never writes:
+    # shared strings, inline strings, boolean cells, and a <row> with no
+    # "r" attribute (row number inferred from the previous row).
+    fixture = tmp_path / "handmade.xlsx"
+    main_ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    with zipfile.ZipFile(fixture, "w") as archive:
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns='
+            '"http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>',
+        )
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{main_ns}" xmlns:r="{rel_ns}">'
+            '<sheets><sheet name="FY22 Home" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>',
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{main_ns}"><si><t>WA</t></si></sst>',
+        )
+        archive.writestr(
+            "xl/worksheets/sheet1.xml",
+            f'<worksheet xmlns="{main_ns}"><sheetData>'
+            '<row r="6"><c r="H6" t="s"><v>0</v></c><c r="I6"><v>12.5</v></c></row>'
+            '<row><c r="H7" t="inlineStr"><is><t>OR</t></is></c>'
+            '<c r="I7" t="b"><v>1</v></c></row>'
+            '</sheetData></worksheet>',
+        )
+
+    rows = gracetulsi_xlsx_pipeline._extract_rows_xml(
+        file_path=fixture, sheet_name="FY22 Home"
+    )
+
+    assert rows["state"].tolist() == ["WA", "OR"]
+    assert rows["loss"].tolist() == [12.5, 1.0]